@@ -6,97 +6,659 @@ Efficiently extracts a specified number of posts from large XML dumps using stre
 Usage: python3 parser.py posts.xml 10
 """
 
+import os
 import sys
-import xml.etree.ElementTree as ET
+import mmap
 import argparse
-import re
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from xml.parsers import expat
+
+try:
+    # lxml drives libxml2's C tokenizer directly and is considerably faster
+    # than the standard library on multi-GB dumps
+    import lxml.etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+# Read and write in multi-MB chunks instead of the default 8 KiB buffer
+INPUT_BUFFER_SIZE = 4 * 1024 * 1024
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Attributes with only a handful of distinct values across a dump; their
+# values are interned so every post shares the same string objects
+INTERNED_ATTRS = frozenset({'PostTypeId', 'ContentLicense'})
+
+# Year sets up to this size are tested with == comparisons, not a set lookup
+SMALL_YEAR_SET = 4
+
+# Initial post capacity; PostColumns doubles it whenever it fills up
+DEFAULT_ROW_CAPACITY = 64 * 1024
+
+# Chunk size fed to expat when lxml is not available
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# Smallest byte range handed to a worker process, and ranges per worker
+MIN_WORKER_CHUNK = 16 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+
+# Characters that must be escaped inside a double-quoted attribute value.
+# Whitespace controls are escaped too, otherwise attribute normalization
+# would turn newlines in post bodies into spaces when the file is re-read.
+ATTR_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    '\n': '&#10;',
+    '\r': '&#13;',
+    '\t': '&#9;',
+})
 
 
 def extract_year_from_date(date_string):
     """Extract year from ISO date string (e.g., '2015-07-14T19:35:44.557')"""
-    try:
-        # Date format is usually: 2015-07-14T19:35:44.557
-        year_match = re.match(r'^(\d{4})', date_string)
-        if year_match:
-            return int(year_match.group(1))
-    except (ValueError, AttributeError):
-        pass
+    # Date format is always: 2015-07-14T19:35:44.557, so the year is a fixed slice
+    year_text = date_string[:4]
+    if date_string[4:5] == '-' and year_text.isdecimal():
+        return int(year_text)
     return 0  # Default year if parsing fails
 
 
-def should_include_post_by_year(post_attrs, min_year=None, max_year=None, specific_years=None):
-    """Determine if a post should be included based on year criteria"""
-    if min_year is None and max_year is None and not specific_years:
-        return True  # No year filtering
+def compile_year_filter(min_year=None, max_year=None, specific_years=None):
+    """
+    Compile a year predicate specialised for the active filter mode
+    
+    The filter mode is fixed for the whole run, so the predicate is generated
+    as straight-line code for exactly the criteria given, e.g.
+    ``def accept(year): return year >= 2015``, instead of re-checking every
+    criterion for each row.
     
-    creation_date = post_attrs.get('CreationDate', '')
+    Returns:
+        Function taking a post year and returning whether to keep the post,
+        or None when no year filtering is requested
+    """
+    conditions = []
+    namespace = {}
+    
+    if specific_years:
+        years = sorted(set(int(year) for year in specific_years))
+        if len(years) <= SMALL_YEAR_SET:
+            # A short comparison chain beats hashing for a handful of years
+            chain = ' or '.join(f'year == {year}' for year in years)
+            conditions.append(f'({chain})')
+        else:
+            namespace['_years'] = frozenset(years)
+            conditions.append('year in _years')
+    if min_year is not None:
+        conditions.append(f'year >= {int(min_year)}')
+    if max_year is not None:
+        conditions.append(f'year <= {int(max_year)}')
+    
+    if not conditions:
+        return None  # No year filtering
+    
+    source = f"def accept(year):\n    return {' and '.join(conditions)}\n"
+    exec(compile(source, '<year filter>', 'exec'), namespace)
+    return namespace['accept']
+
+
+def row_matches_year(attrib, year_filter):
+    """Apply a year predicate to row attributes, keeping rows without a date"""
+    creation_date = attrib.get('CreationDate')
     if not creation_date:
         return True  # Include if no date available
+    return year_filter(extract_year_from_date(creation_date))
+
+
+@contextmanager
+def open_input(input_file):
+    """
+    Open the input dump for a single sequential pass
     
-    post_year = extract_year_from_date(creation_date)
+    The file is memory-mapped so the parser consumes it straight from the
+    page cache. Inputs that cannot be mapped (pipes, empty files) fall back
+    to a binary handle with a large read buffer.
     
-    # Filter by specific years
-    if specific_years and post_year not in specific_years:
-        return False
+    Args:
+        input_file: Path to the input XML file
     
-    # Filter by year range
-    if min_year is not None and post_year < min_year:
-        return False
-    if max_year is not None and post_year > max_year:
+    Yields:
+        A readable binary file-like object
+    """
+    with open(input_file, 'rb', buffering=INPUT_BUFFER_SIZE) as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mm = None
+        
+        if mm is None:
+            # Hint the kernel to read ahead aggressively (Linux/POSIX only)
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass  # Not supported for this file (e.g. a pipe)
+            yield fh
+            return
+        
+        with mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield mm
+
+
+def fast_iter(context, func):
+    """
+    Call func on each element from an lxml iterparse context, freeing as we go
+    
+    After func returns, the element is cleared and its already-parsed
+    siblings are deleted, so the root never holds more than one live row.
+    func can stop the iteration early by raising an exception.
+    
+    Args:
+        context: lxml iterparse context
+        func: Callback taking each parsed element
+    """
+    for event, elem in context:
+        func(elem)
+        
+        # Clear the element and drop already-parsed siblings to free memory
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    del context
+
+
+class LineFormatError(ValueError):
+    """Raised when the dump does not hold exactly one <row/> per line"""
+
+
+# Raw bytes that precede the creation year inside a <row .../> line
+CREATION_DATE_MARKER = b' CreationDate="'
+
+
+def is_row_line(line):
+    """Check that a stripped line holds exactly one self-closing <row/>"""
+    # '<' cannot appear unescaped inside attribute values, so a single
+    # row has exactly one
+    return line.startswith(b'<row') and line.endswith(b'/>') and line.count(b'<') == 1
+
+
+def is_wrapper_line(line):
+    """Check that a stripped line is blank, the XML declaration or a <posts> tag"""
+    if not line or line in (b'<posts>', b'</posts>'):
+        return True
+    return line.startswith(b'<?xml') and line.endswith(b'?>') and line.count(b'<') == 1
+
+
+def looks_line_oriented(source, max_lines=8):
+    """
+    Check whether the head of a dump holds one <row/> per line
+    
+    Reads up to the first row line and rewinds the source afterwards.
+    
+    Args:
+        source: Seekable binary file object positioned at the start
+        max_lines: Maximum number of lines to inspect
+    
+    Returns:
+        True if every inspected line is a wrapper line or a single row
+    """
+    try:
+        for line in islice(iter(source.readline, b''), max_lines):
+            line = line.strip()
+            if is_row_line(line):
+                return True
+            if not is_wrapper_line(line):
+                return False
         return False
+    finally:
+        source.seek(0)
+
+
+def scan_rows_by_line(source, year_filter, end=None):
+    """
+    Yield rows matching the year filter, reading the dump line by line
+    
+    Stack Exchange dumps store one self-closing <row .../> per line, so the
+    creation year can be read from the raw bytes. Only rows that pass the
+    filter are handed to the XML parser; the rest are skipped unparsed.
+    
+    Args:
+        source: Readable binary file object positioned at the start of a line
+        year_filter: Year predicate from compile_year_filter()
+        end: Optional byte offset; lines starting at or after it are not read
+    
+    Yields:
+        Parsed row elements
     
-    return True
+    Raises:
+        LineFormatError: If a line is not a self-contained row element
+    """
+    marker_length = len(CREATION_DATE_MARKER)
+    readline = source.readline
+    tell = source.tell
+    
+    while end is None or tell() < end:
+        line = readline()
+        if not line:
+            break
+        line = line.strip()
+        
+        if not is_row_line(line):
+            # Skip the XML declaration, the <posts> wrapper and blank lines
+            if is_wrapper_line(line):
+                continue
+            raise LineFormatError(f"Line is not a single row: {line[:40]!r}")
+        
+        start = line.find(CREATION_DATE_MARKER)
+        if start == -1:
+            # Unusual quoting or no date at all; let the parser decide
+            elem = ET.fromstring(line)
+            if row_matches_year(elem.attrib, year_filter):
+                yield elem
+            continue
+        
+        start += marker_length
+        year_field = line[start:start + 5]
+        if year_field[:1] != b'"':  # An empty date is always included
+            year = 0  # Default year if parsing fails
+            if year_field[4:5] == b'-' and year_field[:4].isdigit():
+                year = int(year_field[:4])
+            if not year_filter(year):
+                continue
+        
+        yield ET.fromstring(line)
 
 
-def extract_posts_streaming(input_file, num_posts, min_year=None, max_year=None, specific_years=None):
+def row_capacity(num_posts):
     """
-    Extract posts using streaming XML parsing for memory efficiency
+    Number of posts worth preallocating storage for
+    
+    How many rows will actually match is unknown up front, so storage
+    starts at a moderate size and PostColumns grows it geometrically.
     
     Args:
-        input_file: Path to the input XML file
+        num_posts: Number of posts to extract
+    """
+    return min(num_posts, DEFAULT_ROW_CAPACITY)
+
+
+class PostColumns:
+    """
+    Extracted posts stored column-wise, one list of values per attribute
+    
+    Stack Exchange rows share the same small set of attribute names, so
+    keeping a list per attribute avoids a full dict per post. Columns are
+    allocated ahead of the posts, doubling in size whenever they fill up,
+    and filled by index; attributes a post does not have stay None.
+    
+    Each post also records its layout, the tuple of its attribute names in
+    document order. Rows of one kind share a single layout tuple, so this
+    costs one reference per post and lets posts be written back with their
+    attributes in their original order.
+    """
+    
+    def __init__(self, capacity=0):
+        self.columns = {}
+        self.layouts = [None] * capacity
+        self.count = 0
+        self.capacity = capacity
+        # Layout -> its columns in layout order, plus the interned ones
+        self._layout_columns = {}
+    
+    def __len__(self):
+        return self.count
+    
+    def _reserve(self, capacity):
+        """Grow every column to hold at least capacity posts"""
+        capacity = max(capacity, 2 * self.capacity)
+        padding = capacity - self.capacity
+        for column in self.columns.values():
+            column.extend([None] * padding)
+        self.layouts.extend([None] * padding)
+        self.capacity = capacity
+    
+    def _add_layout(self, keys):
+        """Register a new layout, creating any columns it needs"""
+        columns = self.columns
+        layout = tuple(sys.intern(key) for key in keys)
+        for key in layout:
+            if key not in columns:
+                columns[key] = [None] * self.capacity
+        ordered = tuple(columns[key] for key in layout)
+        interned = tuple(columns[key] for key in layout if key in INTERNED_ATTRS)
+        entry = self._layout_columns[layout] = (layout, ordered, interned)
+        return entry
+    
+    def append(self, attrs):
+        """Add one post from its attribute mapping"""
+        index = self.count
+        if index == self.capacity:
+            self._reserve(index + 1)
+        
+        keys = tuple(attrs.keys())
+        entry = self._layout_columns.get(keys)
+        if entry is None:
+            entry = self._add_layout(keys)
+        layout, ordered, interned = entry
+        
+        for column, value in zip(ordered, attrs.values()):
+            column[index] = value
+        for column in interned:
+            column[index] = sys.intern(column[index])
+        self.layouts[index] = layout
+        self.count = index + 1
+    
+    def extend(self, other):
+        """Append all posts from another PostColumns"""
+        start = self.count
+        stop = start + other.count
+        if stop > self.capacity:
+            self._reserve(stop)
+        
+        # Map the other store's layouts onto this store's shared tuples
+        layouts = {}
+        for keys in other._layout_columns:
+            entry = self._layout_columns.get(keys)
+            if entry is None:
+                entry = self._add_layout(keys)
+            layouts[keys] = entry[0]
+        
+        for key, values in other.columns.items():
+            self.columns[key][start:stop] = values[:other.count]
+        self.layouts[start:stop] = [layouts[keys] for keys in other.layouts[:other.count]]
+        self.count = stop
+    
+    def truncate(self, count):
+        """Keep only the first count posts and release unused capacity"""
+        count = min(count, self.count)
+        for column in self.columns.values():
+            del column[count:]
+        del self.layouts[count:]
+        self.count = self.capacity = count
+    
+    def column(self, key):
+        """Return the values of one attribute, None where a post lacks it"""
+        column = self.columns.get(key)
+        if column is None:
+            return [None] * self.count
+        return column[:self.count]
+    
+    def iter_rows(self):
+        """Yield each post as (attribute names, values) in document order"""
+        layout_columns = self._layout_columns
+        layouts = self.layouts
+        for index in range(self.count):
+            layout, ordered, interned = layout_columns[layouts[index]]
+            yield layout, [column[index] for column in ordered]
+
+
+def collect_posts(rows, num_posts):
+    """
+    Store row attributes as posts until num_posts are collected
+    
+    Args:
+        rows: Iterable of row elements that already passed all filters
         num_posts: Number of posts to extract
     
     Returns:
-        List of post dictionaries
+        PostColumns holding the extracted posts
     """
-    posts = []
+    posts = PostColumns(row_capacity(num_posts))
     extracted_count = 0
     
+    # Bind per-row lookups to locals once, outside the hot loop
+    append_post = posts.append
+    
+    for elem in rows:
+        append_post(elem.attrib)
+        extracted_count += 1
+        
+        # Print progress for large extractions
+        if extracted_count % 1000 == 0:
+            print(f"Extracted {extracted_count}/{num_posts} posts...", file=sys.stderr)
+        
+        # Stop parsing when we reach our target
+        if extracted_count >= num_posts:
+            break
+    
+    return posts
+
+
+class TargetReached(Exception):
+    """Raised from a parser callback to stop once enough posts are collected"""
+
+
+def extract_posts_expat(source, num_posts, year_filter=None):
+    """
+    Extract posts with expat's start-element callback
+    
+    Expat hands each <row> over as an attribute dict it already built in C,
+    so no element objects are created or cleared along the way.
+    
+    Args:
+        source: Readable binary file object of the input XML file
+        num_posts: Number of posts to extract
+        year_filter: Optional year predicate from compile_year_filter()
+    
+    Returns:
+        PostColumns holding the extracted posts
+    """
+    posts = PostColumns(row_capacity(num_posts))
+    append_post = posts.append
+    
+    def on_start(name, attrs):
+        if name != 'row':
+            return
+        if year_filter is not None and not row_matches_year(attrs, year_filter):
+            return
+        
+        append_post(attrs)
+        extracted_count = posts.count
+        
+        # Print progress for large extractions
+        if extracted_count % 1000 == 0:
+            print(f"Extracted {extracted_count}/{num_posts} posts...", file=sys.stderr)
+        
+        # Stop parsing when we reach our target
+        if extracted_count >= num_posts:
+            raise TargetReached
+    
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = on_start
+    
+    read = source.read
     try:
-        # Use iterparse for memory-efficient parsing
-        context = ET.iterparse(input_file, events=('start', 'end'))
-        context = iter(context)
+        while True:
+            chunk = read(PARSE_CHUNK_SIZE)
+            parser.Parse(chunk, not chunk)
+            if not chunk:
+                break
+    except TargetReached:
+        pass
+    
+    return posts
+
+
+def extract_posts_lxml(source, num_posts, year_filter=None):
+    """
+    Extract posts with lxml's iterparse, freeing rows via fast_iter()
+    
+    Requires lxml; without it extract_posts_expat() is used instead.
+    
+    Args:
+        source: Path or binary file object of the input XML file
+        num_posts: Number of posts to extract
+        year_filter: Optional year predicate from compile_year_filter()
+    
+    Returns:
+        PostColumns holding the extracted posts
+    """
+    posts = PostColumns(row_capacity(num_posts))
+    append_post = posts.append
+    
+    def on_row(elem):
+        attrib = elem.attrib
+        if year_filter is not None and not row_matches_year(attrib, year_filter):
+            return
         
-        # Get the root element
-        event, root = next(context)
+        append_post(attrib)
+        extracted_count = posts.count
         
-        for event, elem in context:
-            if event == 'end' and elem.tag == 'row':
-                # This is a post record
-                if extracted_count < num_posts:
-                    # Check if post meets year criteria
-                    post_data = dict(elem.attrib)
-                    if should_include_post_by_year(post_data, min_year, max_year, specific_years):
-                        posts.append(post_data)
-                        extracted_count += 1
-                        
-                        # Print progress for large extractions
-                        if extracted_count % 1000 == 0:
-                            print(f"Extracted {extracted_count}/{num_posts} posts...", file=sys.stderr)
-                        
-                        # Stop parsing when we reach our target
-                        if extracted_count >= num_posts:
-                            break
-                
-                # Clear the element to free memory
-                elem.clear()
-                root.clear()
+        # Print progress for large extractions
+        if extracted_count % 1000 == 0:
+            print(f"Extracted {extracted_count}/{num_posts} posts...", file=sys.stderr)
         
-        return posts
+        # Stop parsing when we reach our target
+        if extracted_count >= num_posts:
+            raise TargetReached
+    
+    # With tag='row' lxml only reports row ends, no root bootstrap needed
+    context = ET.iterparse(source, events=('end',), tag='row',
+                           huge_tree=True, recover=False)
+    try:
+        fast_iter(context, on_row)
+    except TargetReached:
+        pass
+    
+    return posts
+
+
+def extract_posts_streaming(input_file, num_posts, year_filter=None):
+    """
+    Extract posts using streaming XML parsing for memory efficiency
+    
+    Args:
+        input_file: Path to the input XML file
+        num_posts: Number of posts to extract
+        year_filter: Optional year predicate from compile_year_filter()
+    
+    Returns:
+        PostColumns holding the extracted posts
+    """
+    try:
+        with open_input(input_file) as fh:
+            # Year-filtered runs on a mapped, line-oriented dump can reject
+            # rows from their raw bytes without parsing them
+            if (year_filter is not None and isinstance(fh, mmap.mmap)
+                    and looks_line_oriented(fh)):
+                try:
+                    rows = scan_rows_by_line(fh, year_filter)
+                    return collect_posts(rows, num_posts)
+                except LineFormatError:
+                    # A malformed line further into the file; discard what was
+                    # collected and rescan from the start with the XML parser
+                    fh.seek(0)
+            
+            if HAVE_LXML:
+                return extract_posts_lxml(fh, num_posts, year_filter)
+            return extract_posts_expat(fh, num_posts, year_filter)
         
     except FileNotFoundError:
         print(f"Error: File '{input_file}' not found.", file=sys.stderr)
         sys.exit(1)
+    except (ET.ParseError, expat.ExpatError) as e:
+        print(f"Error parsing XML: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Unexpected error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def scan_byte_range(task):
+    """
+    Worker entry point: collect matching posts from one byte range of the dump
+    
+    Each line belongs to the range its first byte falls in, so the range
+    start is advanced past the line owned by the previous range.
+    
+    Args:
+        task: Tuple of (input_file, start, end, num_posts, year_args), where
+              year_args are the arguments for compile_year_filter()
+    
+    Returns:
+        PostColumns with at most num_posts posts, in file order
+    """
+    input_file, start, end, num_posts, year_args = task
+    year_filter = compile_year_filter(*year_args)
+    
+    with open(input_file, 'rb') as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if start:
+                mm.seek(start - 1)
+                mm.readline()  # Finish the line owned by the previous range
+            
+            rows = scan_rows_by_line(mm, year_filter, end)
+            posts = collect_posts(islice(rows, num_posts), num_posts)
+            posts.truncate(num_posts)  # Don't ship unused capacity back
+            return posts
+
+
+def extract_posts_parallel(input_file, num_posts, year_args, workers):
+    """
+    Extract year-filtered posts by scanning byte ranges in worker processes
+    
+    Posts.xml holds one <row/> per line, so the file is split into
+    newline-aligned byte ranges that are scanned independently. Results are
+    consumed in file order and the pool is stopped as soon as the first
+    num_posts matches are known, so the output is identical to a serial run.
+    
+    Args:
+        input_file: Path to the input XML file
+        num_posts: Number of posts to extract
+        year_args: Tuple of (min_year, max_year, specific_years)
+        workers: Number of worker processes
+    
+    Returns:
+        PostColumns holding the extracted posts
+    """
+    file_size = os.path.getsize(input_file)
+    if not file_size:
+        # Empty or special files cannot be mapped; use the serial parser
+        return extract_posts_streaming(input_file, num_posts, compile_year_filter(*year_args))
+    
+    num_chunks = max(1, min(workers * CHUNKS_PER_WORKER, file_size // MIN_WORKER_CHUNK))
+    bounds = [file_size * i // num_chunks for i in range(num_chunks + 1)]
+    next_chunk = 0
+    
+    posts = PostColumns(row_capacity(num_posts))
+    try:
+        # Spawned workers start clean instead of inheriting the parent's memory
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(min(workers, num_chunks)) as pool:
+            pending = deque()
+            
+            while True:
+                # Keep at most one range in flight per worker, each limited to
+                # the posts still missing, so held results stay bounded
+                while next_chunk < num_chunks and len(pending) < workers:
+                    task = (input_file, bounds[next_chunk], bounds[next_chunk + 1],
+                            num_posts - len(posts), year_args)
+                    pending.append(pool.apply_async(scan_byte_range, (task,)))
+                    next_chunk += 1
+                
+                if not pending:
+                    break
+                
+                posts.extend(pending.popleft().get())
+                print(f"Extracted {min(len(posts), num_posts)}/{num_posts} posts...", file=sys.stderr)
+                
+                # Stop the remaining workers when we reach our target
+                if len(posts) >= num_posts:
+                    break
+        
+        posts.truncate(num_posts)
+        return posts
+        
+    except LineFormatError:
+        # Not one row per line; use the serial parser instead
+        return extract_posts_streaming(input_file, num_posts, compile_year_filter(*year_args))
     except ET.ParseError as e:
         print(f"Error parsing XML: {e}", file=sys.stderr)
         sys.exit(1)
@@ -110,28 +672,22 @@ def create_output_xml(posts, output_file):
     Create a new XML file with the extracted posts
     
     Args:
-        posts: List of post dictionaries
+        posts: PostColumns holding the extracted posts
         output_file: Path to the output XML file
     """
     try:
-        # Create the root element
-        root = ET.Element("posts")
-        
-        # Add each post as a row element
-        for post in posts:
-            row = ET.SubElement(root, "row")
-            for key, value in post.items():
-                row.set(key, str(value))
-        
-        # Add indentation for readable formatting
-        indent(root)
-        
-        # Create the tree and write to file
-        tree = ET.ElementTree(root)
-        
-        # Write with proper XML declaration and formatting
-        with open(output_file, 'wb') as f:
-            tree.write(f, encoding='utf-8', xml_declaration=True)
+        # Rows are flat and attribute-only, so they are serialized by hand
+        # straight into a large write buffer without any element objects;
+        # values are escaped by str.translate in a single C-level pass
+        with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+            write = f.write
+            write(b'<?xml version="1.0" encoding="utf-8"?>\n<posts>\n')
+            table = ATTR_ESCAPE_TABLE
+            for keys, values in posts.iter_rows():
+                attrs = ' '.join(f'{key}="{value.translate(table)}"'
+                                 for key, value in zip(keys, values))
+                write(f'  <row {attrs} />\n'.encode('utf-8'))
+            write(b'</posts>\n')
         
         print(f"Successfully extracted {len(posts)} posts to '{output_file}'")
         
@@ -140,23 +696,6 @@ def create_output_xml(posts, output_file):
         sys.exit(1)
 
 
-def indent(elem, level=0):
-    """Add indentation to XML elements for pretty printing"""
-    i = "\n" + level * "  "
-    if len(elem):
-        if not elem.text or not elem.text.strip():
-            elem.text = i + "  "
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = i
-        for elem in elem:
-            indent(elem, level + 1)
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = i
-    else:
-        if level and (not elem.tail or not elem.tail.strip()):
-            elem.tail = i
-
-
 def parse_arguments():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(
@@ -168,6 +707,7 @@ Examples:
   python3 parser.py posts.xml 100 --min-year 2015   # Extract 100 posts from 2015 onwards
   python3 parser.py posts.xml 50 --years 2013,2016  # Extract 50 posts from 2013 and 2016
   python3 parser.py posts.xml 200 --min-year 2012 --max-year 2018  # Extract from 2012-2018
+  python3 parser.py posts.xml 500 --years 2012 -j 8 # Scan for 2012 posts with 8 workers
         """
     )
     
@@ -198,6 +738,11 @@ Examples:
     parser.add_argument('--years',
                        help='Specific years to include (comma-separated, e.g., 2015,2018,2023)')
     
+    parser.add_argument('-j', '--workers',
+                       type=int,
+                       default=1,
+                       help='Worker processes for year-filtered scans (default: 1)')
+    
     return parser.parse_args()
 
 
@@ -208,7 +753,6 @@ def validate_arguments(args):
         sys.exit(1)
     
     # Check if input file exists
-    import os
     if not os.path.exists(args.input_file):
         print(f"Error: Input file '{args.input_file}' does not exist", file=sys.stderr)
         sys.exit(1)
@@ -230,6 +774,10 @@ def validate_arguments(args):
     if args.years and (args.min_year or args.max_year):
         print("Error: Cannot use --years with --min-year or --max-year", file=sys.stderr)
         sys.exit(1)
+    
+    if args.workers < 1:
+        print("Error: --workers must be at least 1", file=sys.stderr)
+        sys.exit(1)
 
 
 def main():
@@ -257,8 +805,16 @@ def main():
         elif specific_years:
             print(f"Filter: Years {sorted(specific_years)}")
     
-    # Extract posts using streaming parser
-    posts = extract_posts_streaming(args.input_file, args.num_posts, args.min_year, args.max_year, specific_years)
+    # Specialise the year filter once for this run
+    year_filter = compile_year_filter(args.min_year, args.max_year, specific_years)
+    
+    # Extract posts using streaming parser; only filtered runs need to scan
+    # far enough into the dump to benefit from parallel workers
+    if args.workers > 1 and year_filter is not None:
+        year_args = (args.min_year, args.max_year, specific_years)
+        posts = extract_posts_parallel(args.input_file, args.num_posts, year_args, args.workers)
+    else:
+        posts = extract_posts_streaming(args.input_file, args.num_posts, year_filter)
     
     if not posts:
         print("No posts were extracted. Check if the input file contains valid post data.", file=sys.stderr)
@@ -269,8 +825,8 @@ def main():
         
         # Show some statistics
         post_types = {}
-        for post in posts:
-            post_type = post.get('PostTypeId', 'Unknown')
+        for post_type in posts.column('PostTypeId'):
+            post_type = post_type or 'Unknown'
             post_types[post_type] = post_types.get(post_type, 0) + 1
         
         print("Post type distribution:")
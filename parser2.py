@@ -6,12 +6,156 @@ Creates output in Topics_V2.0.xml format with filtering capabilities.
 Usage: python3 parser2.py posts.xml 10 [options]
 """
 
+import os
 import sys
+import mmap
 import xml.etree.ElementTree as ET
 import argparse
 import html
 import re
-from typing import List, Dict, Set, Optional
+import multiprocessing
+from functools import lru_cache
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from xml.parsers import expat
+from typing import Callable, List, Dict, FrozenSet, Optional
+
+try:
+    # lxml drives libxml2's C tokenizer directly and is considerably faster
+    # than the standard library on multi-GB dumps
+    from lxml import etree as LET
+    HAVE_LXML = True
+except ImportError:
+    LET = None
+    HAVE_LXML = False
+
+# Parse errors raised by whichever XML backend is in use
+XML_PARSE_ERRORS = (ET.ParseError, expat.ExpatError)
+if HAVE_LXML:
+    XML_PARSE_ERRORS += (LET.ParseError,)
+
+# Read buffer for inputs that cannot be memory-mapped
+INPUT_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Write buffer for the Topics XML, so output goes out in few large writes
+OUTPUT_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Largest tag list matched by substring tests rather than a set lookup
+SMALL_TAG_SET = 8
+
+# Distinct Tags strings remembered by the tag helpers. Popular tag
+# combinations recur throughout a dump, so most rows hit the cache.
+TAG_CACHE_SIZE = 8192
+
+# Rows between progress reports on stderr
+PROGRESS_INTERVAL = 5000
+
+# Parallel extraction: smallest byte range worth a worker, and how many
+# ranges each worker gets so early finishers pick up more work
+MIN_WORKER_CHUNK = 16 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+
+# Bytes of row lines fed to a worker's XML parser per call
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# Patterns used once per row, compiled once at import
+_TAG_RE = re.compile(r'<([^>]+)>')
+_WS_RE = re.compile(r'\s+')
+
+
+@contextmanager
+def open_input(input_file: str):
+    """
+    Open the input dump for a single sequential pass
+    
+    The file is memory-mapped so the parser consumes it straight from the
+    page cache. Inputs that cannot be mapped (pipes, empty files) fall back
+    to a binary handle with a large read buffer.
+    
+    Args:
+        input_file: Path to the input XML file
+    
+    Yields:
+        A readable binary file-like object
+    """
+    with open(input_file, 'rb', buffering=INPUT_BUFFER_SIZE) as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mm = None
+        
+        if mm is None:
+            # Hint the kernel to read ahead aggressively (Linux/POSIX only)
+            if hasattr(os, 'posix_fadvise'):
+                try:
+                    os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass  # Not supported for this file (e.g. a pipe)
+            yield fh
+            return
+        
+        with mm:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            yield mm
+
+
+class LineFormatError(ValueError):
+    """Raised when the dump does not hold exactly one <row/> per line"""
+
+
+def is_row_line(line: bytes) -> bool:
+    """Check that a stripped line holds exactly one self-closing <row/>"""
+    # '<' cannot appear unescaped inside attribute values, so a single
+    # row has exactly one
+    return line.startswith(b'<row') and line.endswith(b'/>') and line.count(b'<') == 1
+
+
+def is_wrapper_line(line: bytes) -> bool:
+    """Check that a stripped line is blank, the XML declaration or a <posts> tag"""
+    if not line or line in (b'<posts>', b'</posts>'):
+        return True
+    return line.startswith(b'<?xml') and line.endswith(b'?>') and line.count(b'<') == 1
+
+
+def looks_line_oriented(source, max_lines: int = 8) -> bool:
+    """
+    Check whether the head of a dump holds one <row/> per line
+    
+    Reads up to the first row line and rewinds the source afterwards.
+    
+    Args:
+        source: Seekable binary file object positioned at the start
+        max_lines: Maximum number of lines to inspect
+    
+    Returns:
+        True if every inspected line is a wrapper line or a single row
+    """
+    try:
+        for line in islice(iter(source.readline, b''), max_lines):
+            line = line.strip()
+            if is_row_line(line):
+                return True
+            if not is_wrapper_line(line):
+                return False
+        return False
+    finally:
+        source.seek(0)
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def tag_names(tags_text: str) -> FrozenSet[str]:
+    """Extract the set of tag names from a "<tag1><tag2>" string"""
+    # Empty or tagless text yields no names at all
+    return frozenset(_TAG_RE.findall(tags_text))
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def clean_tags(tags_text: str) -> str:
+    """Turn a "<tag1><tag2>" string into the comma-separated display form"""
+    # Extract tags from <tag1><tag2> format and join with commas
+    return ','.join(_TAG_RE.findall(tags_text))
 
 
 class PostFilter:
@@ -24,100 +168,170 @@ class PostFilter:
         self.min_score = min_score
         self.max_score = max_score  
         self.post_types = post_types or ['1', '2']  # Default: questions and answers
-        self.tags_include = set(tags_include) if tags_include else set()
-        self.tags_exclude = set(tags_exclude) if tags_exclude else set()
+        self.tags_include = frozenset(tags_include) if tags_include else None
+        self.tags_exclude = frozenset(tags_exclude) if tags_exclude else None
         self.min_answers = min_answers
         self.has_accepted_answer = has_accepted_answer
         self.min_views = min_views
         self.min_year = min_year
         self.max_year = max_year
         self.specific_years = set(specific_years) if specific_years else set()
-
-    def should_include_post(self, post_attrs: Dict[str, str]) -> bool:
-        """Determine if a post should be included based on filter criteria"""
+        
+        # ISO dates sort as strings, so compare the 4-digit year prefix
+        # directly instead of converting it to an int for every row
+        self._min_year_str = f"{min_year:04d}" if min_year is not None else None
+        self._max_year_str = f"{max_year:04d}" if max_year is not None else None
+        self._specific_years_str = {f"{year:04d}" for year in self.specific_years}
+        
+        # The criteria are fixed for the whole run, so the per-row predicate
+        # is generated once as straight-line code for exactly those criteria
+        self.should_include_post = self._compile_predicate()
+    
+    def __reduce__(self):
+        # The compiled predicate cannot be pickled, so worker processes
+        # rebuild the filter from its criteria
+        return (PostFilter, (self.min_score, self.max_score, self.post_types,
+                             self.tags_include, self.tags_exclude, self.min_answers,
+                             self.has_accepted_answer, self.min_views, self.min_year,
+                             self.max_year, self.specific_years))
+    
+    def _compile_predicate(self) -> Callable[[Dict[str, str]], bool]:
+        """
+        Compile a predicate specialised for the active filter criteria
+        
+        Only the filters actually requested appear in the generated code, with
+        the cheapest checks first so rejected rows pay as little as possible:
+        post type and accepted answer are plain lookups, scores and counts
+        need int(), and tags need a scan of the tag string. All thresholds are
+        inlined as constants, so no attribute lookups on self happen per row.
+        
+        Returns:
+            Function taking a row's attributes and returning whether to keep it
+        """
+        lines = ["t = a.get('PostTypeId', '1')"]
+        namespace = {}
         
         # Filter by post type
-        post_type = post_attrs.get('PostTypeId', '1')
-        if post_type not in self.post_types:
-            return False
-            
-        # Filter by score
-        score = int(post_attrs.get('Score', '0'))
-        if self.min_score is not None and score < self.min_score:
-            return False
-        if self.max_score is not None and score > self.max_score:
-            return False
-            
-        # Filter by view count (only for questions)
-        if post_type == '1' and self.min_views is not None:
-            views = int(post_attrs.get('ViewCount', '0'))
-            if views < self.min_views:
-                return False
-                
-        # Filter by answer count (only for questions)
-        if post_type == '1' and self.min_answers is not None:
-            answer_count = int(post_attrs.get('AnswerCount', '0'))
-            if answer_count < self.min_answers:
-                return False
-                
+        post_types = sorted(set(self.post_types))
+        if len(post_types) == 1:
+            lines.append(f"if t != {post_types[0]!r}: return False")
+        else:
+            namespace['_post_types'] = frozenset(post_types)
+            lines.append("if t not in _post_types: return False")
+        
         # Filter by accepted answer (only for questions)
-        if post_type == '1' and self.has_accepted_answer is not None:
-            has_accepted = 'AcceptedAnswerId' in post_attrs
-            if self.has_accepted_answer and not has_accepted:
-                return False
-            if not self.has_accepted_answer and has_accepted:
-                return False
-                
-        # Filter by tags (only for questions)
-        if post_type == '1' and (self.tags_include or self.tags_exclude):
-            tags_text = post_attrs.get('Tags', '')
-            post_tags = self._extract_tags(tags_text)
-            
-            # Must include at least one of the required tags
-            if self.tags_include and not self.tags_include.intersection(post_tags):
-                return False
-                
-            # Must not include any excluded tags
-            if self.tags_exclude and self.tags_exclude.intersection(post_tags):
-                return False
+        if self.has_accepted_answer is not None:
+            test = 'not in' if self.has_accepted_answer else 'in'
+            lines.append(f"if t == '1' and 'AcceptedAnswerId' {test} a: return False")
         
-        # Filter by year
-        if self.min_year is not None or self.max_year is not None or self.specific_years:
-            creation_date = post_attrs.get('CreationDate', '')
-            if creation_date:
-                post_year = self._extract_year_from_date(creation_date)
-                
-                # Filter by specific years
-                if self.specific_years and post_year not in self.specific_years:
-                    return False
-                
-                # Filter by year range
-                if self.min_year is not None and post_year < self.min_year:
-                    return False
-                if self.max_year is not None and post_year > self.max_year:
-                    return False
+        # Integer attributes are read as one lookup and a truth test, so a
+        # missing or empty value counts as 0 without parsing a default
+        def int_attr(var, key, indent=''):
+            lines.append(f"{indent}v = a.get({key!r})")
+            lines.append(f"{indent}{var} = int(v) if v else 0")
+        
+        # Filter by score
+        if self.min_score is not None or self.max_score is not None:
+            int_attr('score', 'Score')
+            if self.min_score is not None:
+                lines.append(f"if score < {int(self.min_score)}: return False")
+            if self.max_score is not None:
+                lines.append(f"if score > {int(self.max_score)}: return False")
+        
+        # Filter by view and answer counts (only for questions)
+        if self.min_views is not None or self.min_answers is not None:
+            lines.append("if t == '1':")
+            if self.min_views is not None:
+                int_attr('views', 'ViewCount', '    ')
+                lines.append(f"    if views < {int(self.min_views)}: return False")
+            if self.min_answers is not None:
+                int_attr('answers', 'AnswerCount', '    ')
+                lines.append(f"    if answers < {int(self.min_answers)}: return False")
+        
+        # Filter by year, including posts without a date
+        if self._min_year_str or self._max_year_str or self._specific_years_str:
+            lines.append("d = a.get('CreationDate')")
+            lines.append("if d:")
+            lines.append("    y = d[:4]")
+            lines.append("    if d[4:5] != '-' or not y.isdecimal(): y = '0000'")
+            if self._specific_years_str:
+                namespace['_years'] = frozenset(self._specific_years_str)
+                lines.append("    if y not in _years: return False")
+            if self._min_year_str:
+                lines.append(f"    if y < {self._min_year_str!r}: return False")
+            if self._max_year_str:
+                lines.append(f"    if y > {self._max_year_str!r}: return False")
+        
+        # Filter by tags (only for questions). Tags are stored as
+        # "<tag1><tag2>", so a "<tag>" substring match is exact and avoids
+        # building a tag set for every row. Each substring test is a scan of
+        # the tag string, so long tag lists instead split the string once
+        # and test it against a frozenset.
+        if self.tags_include or self.tags_exclude:
+            lines.append("if t == '1':")
+            lines.append("    tags = a.get('Tags', '')")
+            if max(len(self.tags_include or ()), len(self.tags_exclude or ())) > SMALL_TAG_SET:
+                namespace['_tag_names'] = tag_names
+                lines.append("    names = _tag_names(tags)")
+            
+            for name, tag_set in (('include', self.tags_include),
+                                  ('exclude', self.tags_exclude)):
+                if not tag_set:
+                    continue
+                if len(tag_set) <= SMALL_TAG_SET:
+                    # An empty name never matches, as no tag is empty
+                    found = ' or '.join(f"{f'<{tag}>'!r} in tags"
+                                        for tag in sorted(tag_set) if tag) or 'False'
+                else:
+                    namespace[f'_{name}_tags'] = tag_set
+                    found = f"not _{name}_tags.isdisjoint(names)"
                 
-        return True
+                if name == 'include':
+                    # Must include at least one of the required tags
+                    lines.append(f"    if not ({found}): return False")
+                else:
+                    # Must not include any excluded tags
+                    lines.append(f"    if {found}: return False")
+        
+        lines.append("return True")
+        source = "def should_include_post(a):\n" + ''.join(f"    {line}\n" for line in lines)
+        exec(compile(source, '<post filter>', 'exec'), namespace)
+        return namespace['should_include_post']
+
+
+class Row:
+    """
+    The attributes of an extracted post that the output actually uses
     
-    def _extract_tags(self, tags_text: str) -> Set[str]:
-        """Extract individual tags from the tags string"""
-        if not tags_text:
-            return set()
-            
-        # Tags are in format <tag1><tag2><tag3>
-        tags = re.findall(r'<([^>]+)>', tags_text)
-        return set(tags)
+    Matched posts are kept for the whole run, so each is projected onto
+    these slots instead of keeping a dict of every attribute in the dump.
+    Missing attributes are stored as None.
+    """
     
-    def _extract_year_from_date(self, date_string: str) -> int:
-        """Extract year from ISO date string (e.g., '2015-07-14T19:35:44.557')"""
-        try:
-            # Date format is usually: 2015-07-14T19:35:44.557
-            year_match = re.match(r'^(\d{4})', date_string)
-            if year_match:
-                return int(year_match.group(1))
-        except (ValueError, AttributeError):
-            pass
-        return 0  # Default year if parsing fails
+    __slots__ = ('post_type_id', 'title', 'body', 'tags')
+    
+    def __init__(self, attrs):
+        get = attrs.get
+        self.post_type_id = get('PostTypeId')
+        self.title = get('Title')
+        self.body = get('Body')
+        self.tags = get('Tags')
+
+
+def _escape_text(text: str) -> str:
+    """Escape &, < and > in element text, as ElementTree does"""
+    # Titles and tags rarely contain specials, so three C-level scans
+    # usually let the text through untouched
+    if '&' in text or '<' in text or '>' in text:
+        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return text
+
+
+def _text_element(name: str, text: str) -> str:
+    """Serialise a text-only element the way ElementTree writes it"""
+    if not text:
+        return f'<{name} />'
+    return f'<{name}>{_escape_text(text)}</{name}>'
 
 
 class TopicsFormatter:
@@ -126,54 +340,46 @@ class TopicsFormatter:
     def __init__(self):
         self.topic_counter = 1
         
-    def format_posts_to_topics_xml(self, posts: List[Dict[str, str]], 
+    def format_posts_to_topics_xml(self, posts: List[Row], 
                                   output_file: str) -> None:
         """Convert posts to Topics XML format and write to file"""
         
-        # Create root element
-        root = ET.Element("Topics")
-        
-        # Process only questions (PostTypeId=1) for topics format
-        questions = [p for p in posts if p.get('PostTypeId', '1') == '1']
-        
-        for post in questions:
-            topic = self._create_topic_element(post)
-            root.append(topic)
-            
-        # Add proper XML formatting
-        self._indent(root)
-        
-        # Write to file
-        tree = ET.ElementTree(root)
-        
-        # Create XML declaration manually for better control
-        with open(output_file, 'w', encoding='utf-8') as f:
+        # Topics are written as they are formatted, so no element tree is
+        # held in memory. The layout matches ElementTree's serialisation of
+        # the tree with 3-space indentation.
+        with open(output_file, 'w', encoding='utf-8',
+                  buffering=OUTPUT_BUFFER_SIZE) as f:
             f.write('<?xml version="1.0" ?>\n')
-            # Write the tree without XML declaration (we added our own)
-            tree.write(f, encoding='unicode', xml_declaration=False)
             
-    def _create_topic_element(self, post: Dict[str, str]) -> ET.Element:
-        """Create a Topic element from a post"""
+            has_topics = False
+            for post in posts:
+                # Process only questions (PostTypeId=1) for topics format;
+                # a post without a PostTypeId counts as a question
+                if post.post_type_id not in (None, '1'):
+                    continue
+                if not has_topics:
+                    f.write('<Topics>')
+                    has_topics = True
+                f.write(self._format_topic(post))
+            
+            f.write('\n</Topics>\n' if has_topics else '<Topics />')
+            
+    def _format_topic(self, post: Row) -> str:
+        """Format a post as an indented Topic element"""
         
-        topic = ET.Element("Topic", number=f"A.{self.topic_counter}")
+        number = self.topic_counter
         self.topic_counter += 1
         
-        # Add Title element
-        title_elem = ET.SubElement(topic, "Title")
-        title_text = post.get('Title', 'Untitled Question')
-        title_elem.text = self._process_html_content(title_text)
-        
-        # Add Question element  
-        question_elem = ET.SubElement(topic, "Question")
-        body_text = post.get('Body', '')
-        question_elem.text = self._process_html_content(body_text)
-        
-        # Add Tags element
-        tags_elem = ET.SubElement(topic, "Tags")
-        tags_text = self._extract_clean_tags(post.get('Tags', ''))
-        tags_elem.text = tags_text
+        title = post.title if post.title is not None else 'Untitled Question'
+        title = self._process_html_content(title)
+        question = self._process_html_content(post.body)
+        tags = clean_tags(post.tags) if post.tags else ""
         
-        return topic
+        return (f'\n   <Topic number="A.{number}">'
+                f'\n      {_text_element("Title", title)}'
+                f'\n      {_text_element("Question", question)}'
+                f'\n      {_text_element("Tags", tags)}'
+                f'\n   </Topic>')
         
     def _process_html_content(self, content: str) -> str:
         """Process HTML content to match Topics format"""
@@ -184,37 +390,14 @@ class TopicsFormatter:
         # We just need to clean it up a bit for the Topics format
         
         # Remove some excessive whitespace while preserving structure
-        content = re.sub(r'\s+', ' ', content)
+        content = _WS_RE.sub(' ', content)
         content = content.strip()
         
         return content
-        
-    def _extract_clean_tags(self, tags_text: str) -> str:
-        """Extract and clean tags for display"""
-        if not tags_text:
-            return ""
-            
-        # Extract tags from <tag1><tag2> format
-        tags = re.findall(r'<([^>]+)>', tags_text)
-        
-        # Join with commas
-        return ','.join(tags)
-        
-    def _indent(self, elem, level=0):
-        """Add indentation for pretty printing"""
-        i = "\n" + level * "   "
-        if len(elem):
-            if not elem.text or not elem.text.strip():
-                elem.text = i + "   "
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-            for child in elem:
-                self._indent(child, level + 1)
-            if not child.tail or not child.tail.strip():
-                child.tail = i
-        else:
-            if level and (not elem.tail or not elem.tail.strip()):
-                elem.tail = i
+
+
+class _StopParsing(Exception):
+    """Raised from the row handler once the target count is reached"""
 
 
 class StreamingPostExtractor:
@@ -222,52 +405,256 @@ class StreamingPostExtractor:
     Advanced streaming XML parser with filtering capabilities
     """
     
-    def __init__(self, target_count: int, post_filter: PostFilter):
+    def __init__(self, target_count: int, post_filter: PostFilter,
+                 report_progress: bool = True, track_positions: bool = False):
         self.target_count = target_count
         self.post_filter = post_filter
+        self.report_progress = report_progress
         self.extracted_count = 0
         self.total_processed = 0
         self.posts = []
+        # Records processed so far at each extracted post, when tracked
+        self.match_positions = [] if track_positions else None
         
-    def extract_from_file(self, input_file: str) -> List[Dict[str, str]]:
-        """Extract filtered posts from XML file"""
+    def _make_row_handler(self):
+        """
+        Build the per-row callback with its hot lookups bound to locals
         
-        try:
-            # Use iterparse for memory-efficient parsing
-            context = ET.iterparse(input_file, events=('start', 'end'))
-            context = iter(context)
+        The callback runs once per row of the dump, so the filter, the list
+        append and stderr are resolved once here, and progress is reported
+        against a running threshold instead of a modulo on every row.
+        
+        Returns:
+            Tuple of the row callback and a function returning the
+            (processed, extracted) counts so far
+        """
+        should_include_post = self.post_filter.should_include_post
+        append = self.posts.append
+        target_count = self.target_count
+        stderr = sys.stderr
+        report_progress = self.report_progress
+        positions = self.match_positions
+        processed = self.total_processed
+        extracted = self.extracted_count
+        next_report = (processed // PROGRESS_INTERVAL + 1) * PROGRESS_INTERVAL
+        if not report_progress:
+            next_report = float('inf')  # Never report
+        
+        def handle_row(attrs):
+            nonlocal processed, extracted, next_report
+            processed += 1
             
-            # Get the root element
-            event, root = next(context)
+            # Check if this post matches our filter criteria
+            if should_include_post(attrs):
+                # Keep only the attributes the output needs
+                append(Row(attrs))
+                extracted += 1
+                if positions is not None:
+                    positions.append(processed)
+                
+                # Check if we've reached our target
+                if extracted >= target_count:
+                    if report_progress:
+                        print(f"Target of {target_count} posts reached!", file=stderr)
+                    raise _StopParsing
             
+            # Progress reporting for large files
+            if processed >= next_report:
+                next_report += PROGRESS_INTERVAL
+                print(f"Processed {processed} records, "
+                      f"extracted {extracted}", file=stderr)
+        
+        def counts():
+            return processed, extracted
+        
+        return handle_row, counts
+    
+    def _parse_lxml(self, input_file: str, handle_row) -> None:
+        """Feed every <row> to the handler using lxml's iterparse"""
+        with open_input(input_file) as source:
+            # With tag='row' lxml only reports row ends, no root bootstrap needed
+            context = LET.iterparse(source, events=('end',), tag='row',
+                                    huge_tree=True, recover=True)
             for event, elem in context:
-                if event == 'end' and elem.tag == 'row':
-                    self.total_processed += 1
+                handle_row(elem.attrib)
+                
+                # Clear the element and drop already-parsed siblings to free memory
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+    
+    def _parse_expat(self, input_file: str, handle_row) -> None:
+        """Feed every <row> to the handler straight from expat callbacks"""
+        
+        def start_element(name, attrs):
+            if name == 'row':
+                handle_row(attrs)
+        
+        # Expat builds each attribute dict in C and no element tree is kept
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = start_element
+        
+        with open_input(input_file) as source:
+            parser.ParseFile(source)
+    
+    def _parse_line_range(self, input_file: str, start: int, end: int,
+                          handle_row) -> None:
+        """
+        Feed the <row/> lines of one byte range of the dump to the handler
+        
+        Each line belongs to the range its first byte falls in, so the range
+        start is advanced past the line owned by the previous range. Row
+        lines are batched into a synthetic <posts> document for expat.
+        
+        Raises:
+            LineFormatError: If a line is not a self-contained row element
+        """
+        
+        def start_element(name, attrs):
+            if name == 'row':
+                handle_row(attrs)
+        
+        parser = expat.ParserCreate()
+        parser.StartElementHandler = start_element
+        parser.Parse(b'<posts>')
+        
+        with open(input_file, 'rb') as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if start:
+                    mm.seek(start - 1)
+                    mm.readline()  # Finish the line owned by the previous range
+                
+                readline = mm.readline
+                tell = mm.tell
+                batch = []
+                batch_size = 0
+                
+                while tell() < end:
+                    line = readline()
+                    if not line:
+                        break
+                    line = line.strip()
                     
-                    # Check if this post matches our filter criteria
-                    if self.post_filter.should_include_post(elem.attrib):
-                        # Convert element to dictionary
-                        post_data = dict(elem.attrib)
-                        self.posts.append(post_data)
-                        self.extracted_count += 1
-                        
-                        # Check if we've reached our target
-                        if self.extracted_count >= self.target_count:
-                            print(f"Target of {self.target_count} posts reached!", file=sys.stderr)
-                            break
+                    if not is_row_line(line):
+                        # Skip the XML declaration, the <posts> wrapper and blank lines
+                        if is_wrapper_line(line):
+                            continue
+                        raise LineFormatError(f"Line is not a single row: {line[:40]!r}")
+                    
+                    batch.append(line)
+                    batch_size += len(line)
+                    if batch_size >= PARSE_CHUNK_SIZE:
+                        parser.Parse(b''.join(batch))
+                        batch = []
+                        batch_size = 0
+                
+                parser.Parse(b''.join(batch))
+        
+        parser.Parse(b'</posts>', True)
+    
+    def extract_from_range(self, input_file: str, start: int, end: int) -> List[Row]:
+        """Extract filtered posts from the lines starting in [start, end)"""
+        
+        handle_row, counts = self._make_row_handler()
+        try:
+            self._parse_line_range(input_file, start, end, handle_row)
+        except _StopParsing:
+            pass  # Target count reached before the end of the range
+        finally:
+            self.total_processed, self.extracted_count = counts()
+        return self.posts
+    
+    def _extract_parallel(self, input_file: str, workers: int) -> List[Row]:
+        """
+        Extract filtered posts by parsing byte ranges in worker processes
+        
+        Posts.xml holds one <row/> per line, so the file is split into
+        newline-aligned byte ranges that are filtered independently. Results
+        are consumed in file order and the pool is stopped as soon as the
+        first target_count matches are known, so both the output and the
+        processed count are identical to a serial run. Dumps that are not
+        line-oriented use the serial parser.
+        """
+        file_size = os.path.getsize(input_file)
+        with open_input(input_file) as source:
+            line_oriented = file_size and looks_line_oriented(source)
+        if not line_oriented:
+            return self._extract_serial(input_file)
+        
+        num_chunks = max(1, min(workers * CHUNKS_PER_WORKER, file_size // MIN_WORKER_CHUNK))
+        bounds = [file_size * i // num_chunks for i in range(num_chunks + 1)]
+        next_chunk = 0
+        
+        try:
+            # Spawned workers start clean instead of inheriting the parent's memory
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(min(workers, num_chunks)) as pool:
+                pending = deque()
+                
+                while True:
+                    # Keep at most one range in flight per worker, each limited
+                    # to the posts still missing, so held results stay bounded
+                    while next_chunk < num_chunks and len(pending) < workers:
+                        task = (input_file, bounds[next_chunk], bounds[next_chunk + 1],
+                                self.target_count - len(self.posts), self.post_filter)
+                        pending.append(pool.apply_async(extract_byte_range, (task,)))
+                        next_chunk += 1
+                    
+                    if not pending:
+                        break
                     
-                    # Clear the element to free memory
-                    elem.clear()
-                    root.clear()
+                    posts, processed, positions = pending.popleft().get()
+                    missing = self.target_count - len(self.posts)
                     
-                    # Progress reporting for large files
-                    if self.total_processed % 5000 == 0:
-                        print(f"Processed {self.total_processed} records, "
-                              f"extracted {self.extracted_count}", file=sys.stderr)
+                    if len(posts) >= missing:
+                        # The range was limited when it was dispatched, so it
+                        # may have read past the row a serial run stops at;
+                        # count only the rows up to the last post needed
+                        self.posts.extend(posts[:missing])
+                        self.total_processed += positions[missing - 1]
+                        print(f"Target of {self.target_count} posts reached!", file=sys.stderr)
+                        
+                        # Stop the remaining workers when we reach our target
+                        break
+                    
+                    self.posts.extend(posts)
+                    self.total_processed += processed
+                    print(f"Processed {self.total_processed} records, "
+                          f"extracted {len(self.posts)}", file=sys.stderr)
             
-            return self.posts
+        except LineFormatError:
+            # Not one row per line after all; start over with the serial parser
+            self.posts = []
+            self.total_processed = 0
+            return self._extract_serial(input_file)
+        
+        self.extracted_count = len(self.posts)
+        return self.posts
+    
+    def _extract_serial(self, input_file: str) -> List[Row]:
+        """Extract filtered posts with a single streaming pass over the file"""
+        
+        handle_row, counts = self._make_row_handler()
+        try:
+            if HAVE_LXML:
+                self._parse_lxml(input_file, handle_row)
+            else:
+                self._parse_expat(input_file, handle_row)
+        except _StopParsing:
+            pass  # Target count reached before the end of the file
+        finally:
+            self.total_processed, self.extracted_count = counts()
+        return self.posts
+    
+    def extract_from_file(self, input_file: str, workers: int = 1) -> List[Row]:
+        """Extract filtered posts from XML file, optionally with worker processes"""
+        
+        try:
+            if workers > 1:
+                return self._extract_parallel(input_file, workers)
+            return self._extract_serial(input_file)
             
-        except ET.ParseError as e:
+        except XML_PARSE_ERRORS as e:
             print(f"XML parsing error: {e}", file=sys.stderr)
             raise
         except FileNotFoundError:
@@ -278,6 +665,24 @@ class StreamingPostExtractor:
             raise
 
 
+def extract_byte_range(task):
+    """
+    Worker entry point: extract filtered posts from one byte range of the dump
+    
+    Args:
+        task: Tuple of (input_file, start, end, target_count, post_filter)
+    
+    Returns:
+        Tuple of the matching rows, in file order, the number of rows read,
+        and the number of rows read up to and including each matching row
+    """
+    input_file, start, end, target_count, post_filter = task
+    extractor = StreamingPostExtractor(target_count, post_filter,
+                                       report_progress=False, track_positions=True)
+    posts = extractor.extract_from_range(input_file, start, end)
+    return posts, extractor.total_processed, extractor.match_positions
+
+
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create and configure argument parser"""
     parser = argparse.ArgumentParser(
@@ -303,6 +708,9 @@ Examples:
   python3 parser2.py posts.xml 15 --years 2015,2018,2022 --questions-only
     Extract 15 questions from specific years (2015, 2018, 2022)
 
+  python3 parser2.py posts.xml 500 --min-score 50 -j 8
+    Extract 500 posts with score >= 50, scanning with 8 worker processes
+
 Filtering Options:
   --questions-only     Extract only questions (PostTypeId=1)
   --answers-only      Extract only answers (PostTypeId=2)
@@ -390,6 +798,11 @@ Filtering Options:
                        action='store_true',
                        help='Enable verbose output')
     
+    parser.add_argument('-j', '--workers',
+                       type=int,
+                       default=1,
+                       help='Worker processes for scanning the dump (default: 1)')
+    
     return parser
 
 
@@ -398,7 +811,6 @@ def validate_arguments(args) -> None:
     if args.num_posts <= 0:
         raise ValueError("Number of posts must be greater than 0")
     
-    import os
     if not os.path.exists(args.input_file):
         raise FileNotFoundError(f"Input file '{args.input_file}' not found")
     
@@ -408,6 +820,9 @@ def validate_arguments(args) -> None:
     if args.has_accepted and args.no_accepted:
         raise ValueError("Cannot specify both --has-accepted and --no-accepted")
     
+    if args.workers < 1:
+        raise ValueError("--workers must be at least 1")
+    
     # Validate year arguments
     current_year = 2025  # Update as needed
     if args.min_year and (args.min_year < 2008 or args.min_year > current_year):
@@ -437,11 +852,11 @@ def create_post_filter(args) -> PostFilter:
     # Parse tag filters
     tags_include = None
     if args.include_tags:
-        tags_include = [tag.strip() for tag in args.include_tags.split(',')]
+        tags_include = [tag.strip() for tag in args.include_tags.split(',') if tag.strip()]
         
     tags_exclude = None
     if args.exclude_tags:
-        tags_exclude = [tag.strip() for tag in args.exclude_tags.split(',')]
+        tags_exclude = [tag.strip() for tag in args.exclude_tags.split(',') if tag.strip()]
     
     # Handle accepted answer filter
     has_accepted_answer = None
@@ -504,7 +919,7 @@ def main():
         
         # Extract posts
         extractor = StreamingPostExtractor(args.num_posts, post_filter)
-        posts = extractor.extract_from_file(args.input_file)
+        posts = extractor.extract_from_file(args.input_file, args.workers)
         
         if not posts:
             print("No posts matched the filter criteria.", file=sys.stderr)
@@ -520,7 +935,9 @@ def main():
                 # Show post type distribution
                 post_types = {}
                 for post in posts:
-                    ptype = post.get('PostTypeId', 'Unknown')
+                    ptype = post.post_type_id
+                    if ptype is None:
+                        ptype = 'Unknown'
                     post_types[ptype] = post_types.get(ptype, 0) + 1
                 
                 print(f"  Post type breakdown:")
@@ -535,7 +952,6 @@ def main():
         print(f"Successfully created Topics XML with {len(posts)} posts in '{args.output}'")
         
         if args.verbose:
-            import os
             output_size = os.path.getsize(args.output) / 1024
             print(f"Output file size: {output_size:.1f} KB")
         